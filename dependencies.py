@@ -9,11 +9,39 @@ notes specific requirements like ECCODES for pygrib.
 
 import sys
 import os
-import importlib.metadata # Used to retrieve installed package versions
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-def check_library(library_name, pypi_name=None, extra_info=None):
+# Names of the standard library modules (Python 3.10+); empty on older versions,
+# in which case standard modules simply go through the regular import check.
+STDLIB_MODULES = getattr(sys, "stdlib_module_names", frozenset())
+
+def _normalize_name(name):
+    """
+    Normalize a distribution name for lookups (PEP 503: case-insensitive, '-', '_' and '.' equivalent).
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def get_installed_versions():
+    """
+    Return a {normalized distribution name: version} map of every installed distribution,
+    built from a single sweep over sys.path instead of one metadata search per package.
     """
-    Attempts to import a library, gets its installed version, and prints its status.
+    # Imported lazily: the metadata machinery is only needed when versions are reported.
+    import importlib.metadata
+    installed = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            # Keep the first match on sys.path, as importlib.metadata.version() would.
+            installed.setdefault(_normalize_name(name), dist.version)
+    return installed
+
+def check_library(library_name, pypi_name=None, extra_info=None, installed=None):
+    """
+    Attempts to import a library, gets its installed version, and returns its status
+    as a printable (possibly multi-line) message. Nothing is printed here, so that
+    several checks can run concurrently and still be reported in a fixed order.
     Args:
         library_name (str): The name of the library to import (e.g., 'pandas').
         pypi_name (str, optional): The name of the package on PyPI if different
@@ -21,37 +49,43 @@ def check_library(library_name, pypi_name=None, extra_info=None):
                                    or includes a suggested version for installation.
         extra_info (str, optional): Additional information or troubleshooting
                                     tips for the library.
+        installed (dict, optional): Installed versions as returned by
+                                    get_installed_versions(); built on demand if omitted.
     """
     # Extract package name from pypi_name if it includes a version (e.g., 'cdsapi==0.7.6')
     actual_pypi_name = pypi_name.split('==')[0] if pypi_name else library_name
     install_suggestion = pypi_name if pypi_name else library_name # Use the full string for pip install
 
+    # Standard library modules ship with the interpreter and have no package metadata.
+    if pypi_name is None and library_name.split('.')[0] in STDLIB_MODULES:
+        return f"✅ '{library_name}' is part of the Python standard library."
+
+    lines = []
     try:
         # Attempt to import the library
         __import__(library_name)
         
         # Try to get the installed version
-        installed_version = "N/A" # Default if version can't be found or for built-in modules
         try:
-            # Use the actual package name for importlib.metadata
-            installed_version = importlib.metadata.version(actual_pypi_name)
-        except importlib.metadata.PackageNotFoundError:
-            # This can happen for some built-in modules or if metadata is missing
-            pass
+            if installed is None:
+                installed = get_installed_versions()
+            # Built-in modules have no distribution metadata and fall back to "N/A"
+            installed_version = installed.get(_normalize_name(actual_pypi_name), "N/A")
         except Exception as e:
             # Catch any other unexpected errors during version retrieval
             installed_version = f"Error: {e}"
 
-        print(f"✅ '{library_name}' is installed. Version: {installed_version}")
+        lines.append(f"✅ '{library_name}' is installed. Version: {installed_version}")
 
     except ImportError:
-        print(f"❌ '{library_name}' is NOT installed.")
-        print(f"   Please install it using pip: pip install {install_suggestion}")
+        lines.append(f"❌ '{library_name}' is NOT installed.")
+        lines.append(f"   Please install it using pip: pip install {install_suggestion}")
         if extra_info:
-            print(f"   Note: {extra_info}")
+            lines.append(f"   Note: {extra_info}")
     except Exception as e:
-        print(f"⚠️  An unexpected error occurred while checking '{library_name}': {e}")
-        print(f"   Details: {e}")
+        lines.append(f"⚠️  An unexpected error occurred while checking '{library_name}': {e}")
+        lines.append(f"   Details: {e}")
+    return "\n".join(lines)
 
 def main():
     """
@@ -73,6 +107,7 @@ def main():
         ("pandas", "pandas==2.3.1", None),
         ("numpy", "numpy==2.3.2", "If you encounter 'numpy.dtype size changed' errors, ensure pygrib is compatible with your NumPy version."),
         ("tqdm", "tqdm==4.67.1", None),
+        ("pyarrow", "pyarrow==21.0.0", "Optional: enables the Parquet output."),
 
         # New packages to check
         ("fpdf", "fpdf==1.7.2", "Used for generating PDF documents."),
@@ -90,8 +125,13 @@ def main():
         ("time", None, "This is a standard Python library for time-related functions."),
     ]
 
-    for lib, pypi, info in libraries_to_check:
-        check_library(lib, pypi, info)
+    installed = get_installed_versions()
+    # Importing the large libraries (C extension initialization, font caches, ...) is
+    # overlapped across threads; reports are printed in the original list order.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reports = executor.map(lambda entry: check_library(*entry, installed=installed), libraries_to_check)
+        for report in reports:
+            print(report)
     
     print("\n" + "="*60)
     print("Library Check Complete.".center(60))
@@ -100,17 +140,4 @@ def main():
     print("="*60 + "\n")
 
 if __name__ == "__main__":
-    # It's good practice to set the multiprocessing start method early,
-    # especially for applications using pygrib which can have C-library interactions.
-    try:
-        import multiprocessing
-        # 'spawn' is generally safer for cross-platform compatibility and C extensions
-        multiprocessing.set_start_method("spawn", force=True)
-    except RuntimeError:
-        # This can happen if set_start_method is called more than once
-        # or if the context is already set.
-        pass
-    except ImportError:
-        print("Warning: 'multiprocessing' library not found. Parallel processing features might be unavailable.")
-
     main()
@@ -14,7 +14,9 @@ https://confluence.ecmwf.int/display/UDOC/MARS+user+documentation
 
 The script supports two operational modes:
     1. Download & Process:
-         - Downloads ERA5 data in monthly chunks from the CDS API (using MARS syntax rules).
+         - Downloads ERA5 data from the CDS API (using MARS syntax rules) in chunks of consecutive
+           months (as many as fit the per-request cost budget), keeping several requests in flight
+           at once to overlap CDS queue waits.
          - As each GRIB file is downloaded (or confirmed to exist), it is immediately processed with pygrib.
          - For each GRIB message, the script first attempts to match by the GRIB message short name
            (which is assumed to be the same as the internal variable name). If not found, it falls back
@@ -39,21 +41,27 @@ For more detailed information on CDS API and MARS request syntax, please refer t
 https://confluence.ecmwf.int/display/UDOC/MARS+user+documentation
 """
 
-import cdsapi
 import os
 import sys
 import time
+import random
 import calendar
+import itertools
+import re
 import pandas as pd
 import numpy as np
 from tqdm import tqdm
 import logging
-from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import multiprocessing
 
-# Use the "spawn" start method for better compatibility with C libraries (e.g., ECCODES/pygrib)
-if __name__ == '__main__':
-    multiprocessing.set_start_method("spawn", force=True)
+# Worker processes are never forked from the main process (which runs threads and holds
+# ECCODES/pygrib state) for better compatibility with C libraries. On Linux they are
+# forked from a clean "forkserver" process that has this module and pygrib preloaded, so
+# each worker starts without re-importing them; elsewhere they use "spawn". The start
+# method is scoped to this script's pools rather than set globally.
+MP_CONTEXT = multiprocessing.get_context("forkserver" if sys.platform.startswith("linux") else "spawn")
 
 # ----------------------------- Unified Variable Mapping -----------------------------
 # The VARIABLES dictionary now maps the internal variable name (which is also the expected GRIB short name)
@@ -69,13 +77,9 @@ VARIABLES = {
 # Derive the list of param IDs for the CDS API/MARS request.
 PARAM_IDS = list(VARIABLES.values())
 
-def format_param_id(param_id_str):
-    """
-    Convert a 6-digit parameter id string (e.g., '140229') to the dot-separated format (e.g., '229.140').
-    """
-    if len(param_id_str) != 6:
-        return param_id_str
-    return f"{int(param_id_str[3:]):03d}.{int(param_id_str[:3])}"
+# Numeric Parameter ID (e.g., 140229) -> variable key, used to match messages without the expected
+# short name. paramId is computed by ECCODES for both GRIB1 and GRIB2 messages.
+PARAM_ID_TO_KEY = {int(param_id): key for key, param_id in VARIABLES.items()}
 
 # ----------------------------- Configuration -----------------------------
 # Target location: LEIXOES OCEANIC BUOY, Porto/Portugal
@@ -87,11 +91,20 @@ START_YEAR = 1940
 END_YEAR = 2024
 YEARS = list(range(START_YEAR, END_YEAR + 1))
 
-# Directories for GRIB files and output CSV.
+# Directories for GRIB files and output CSV (created by main(), not on import).
 DATA_DIR = 'grib'
 RESULTS_DIR = 'results'
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(RESULTS_DIR, exist_ok=True)
+
+# Extracted values are stored as float32 (ERA5 wave/wind fields carry far less precision).
+# The CSV is written by pyarrow, which prints the shortest float32 representation; without
+# pyarrow, pandas writes it with this C-level format, whose text can differ from pyarrow's
+# in the last digits (e.g., '232.4447' instead of '232.44475').
+CSV_FLOAT_FORMAT = '%.7g'
+
+# Output formats written to RESULTS_DIR as download_era5_data.<format>. Parquet (needs
+# pyarrow) is much faster to write and read back than CSV; drop 'csv' from the list if
+# the text file is not needed.
+OUTPUT_FORMATS = ['csv', 'parquet']
 
 # Define the bounding box (degrees) for the target area.
 # Format: [North, West, South, East] as required by the MARS request.
@@ -105,63 +118,271 @@ AREA = [NORTH, WEST, SOUTH, EAST]
 # Grid resolution for extraction.
 GRID = [0.25, 0.25]
 
-# Delay and retry configuration for the CDS API request.
-REQUEST_DELAY = 120  # seconds delay between requests (to avoid overloading the server)
+# Power factor of the Inverse Distance Weighting (IDW) interpolation.
+IDW_POWER = 2
+
+# Settings the extracted values depend on. They are stored in each extraction cache, so
+# that a cache written for another target point, IDW power or variable set is not reused.
+EXTRACTION_SETTINGS = repr((LATITUDE, LONGITUDE, IDW_POWER, sorted(VARIABLES.items())))
+CACHE_SETTINGS_KEY = b'era5_extraction_settings'
+
+# Months are coalesced into a single CDS request as long as the number of GRIB fields
+# requested (variables x hourly steps) stays below this budget. The CDS limit counts
+# fields, not grid points, so a small AREA does not change it.
+MAX_REQUEST_FIELDS = 100_000
+
+def choose_chunk_months(n_vars):
+    """
+    Pick the largest number of months per request (a divisor of 12) whose number of
+    fields (variables x hourly steps) stays below MAX_REQUEST_FIELDS.
+    """
+    for chunk_months in (12, 6, 4, 3, 2):
+        fields = n_vars * 24 * 31 * chunk_months
+        if fields < MAX_REQUEST_FIELDS:
+            return chunk_months
+    return 1
+
+CHUNK_MONTHS = choose_chunk_months(len(VARIABLES))
+
+# Delay and retry configuration for the CDS API request. Failed requests are retried
+# with a jittered exponential backoff (RETRY_BASE_DELAY * 2**attempt, capped at
+# MAX_RETRY_DELAY), unless the server asks for a specific delay via Retry-After.
+RETRY_BASE_DELAY = 5  # seconds
+MAX_RETRY_DELAY = 300  # seconds
 MAX_RETRIES = 5
 
-# Logging configuration.
+# HTTP statuses that retrying cannot fix (bad credentials, licence not accepted).
+FATAL_HTTP_STATUSES = (401, 403)
+
+# Number of CDS API requests kept in flight at once. The CDS queue serves a handful
+# of concurrent jobs per user, so submitting them in parallel overlaps queue waits.
+DOWNLOAD_WORKERS = 6
+
+# Number of worker processes decoding GRIB files. Decoding is largely memory-bound, so
+# one worker per physical core (about half the logical CPUs with SMT) is enough.
+PROCESS_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Logging configuration. Handlers are only installed by configure_logging(), so that
+# importing this module has no side effects.
 LOG_FILE = 'download_era5_data.log'
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+logger = logging.getLogger(__name__)
+
+def configure_logging():
+    """
+    Send log records to LOG_FILE. Called by main() and, through _init_worker(), by
+    each worker process (spawned workers do not run main()).
+    """
+    logging.basicConfig(
+        filename=LOG_FILE,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+# pygrib module, imported once per worker process by _init_worker().
+_pygrib = None
+
+def _init_worker():
+    """
+    Initializer of the GRIB processing pool: configure logging and import pygrib (which
+    loads the ECCODES definitions) once when the worker starts, not in its first task.
+    """
+    global _pygrib
+    configure_logging()
+    try:
+        import pygrib
+        _pygrib = pygrib
+    except Exception as e:
+        logger.error(f"Failed to import pygrib in worker process: {e}")
+
+def process_pool():
+    """
+    Create the process pool used to extract data from GRIB files.
+    """
+    if MP_CONTEXT.get_start_method() == "forkserver":
+        MP_CONTEXT.set_forkserver_preload(["__main__", "pygrib"])
+    return ProcessPoolExecutor(max_workers=PROCESS_WORKERS, mp_context=MP_CONTEXT,
+                               initializer=_init_worker)
+
+def _ensure_env():
+    """
+    Prepare the run environment: create the data and results directories and configure logging.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    configure_logging()
 
 # ----------------------------- Utility Functions -----------------------------
+def month_chunks(chunk_months):
+    """
+    Split the year into consecutive (first_month, last_month) periods of chunk_months months.
+    """
+    return [(start, start + chunk_months - 1) for start in range(1, 13, chunk_months)]
+
+def grib_file_name(year, month_start, month_end):
+    """
+    Name of the GRIB file holding months month_start..month_end of a year
+    (e.g., 'ERA5_2020.grib' for a whole year, 'ERA5_2020_05.grib' for a single month,
+    'ERA5_2020_01-06.grib' otherwise).
+    """
+    if (month_start, month_end) == (1, 12):
+        return f"ERA5_{year}.grib"
+    if month_start == month_end:
+        return f"ERA5_{year}_{month_start:02d}.grib"
+    return f"ERA5_{year}_{month_start:02d}-{month_end:02d}.grib"
+
+def grib_file_months(file_name):
+    """
+    Return (year, first_month, last_month) for a file named by grib_file_name(),
+    or None for any other name.
+    """
+    match = re.fullmatch(r"ERA5_(\d{4})(?:_(\d{2})(?:-(\d{2}))?)?\.grib", file_name)
+    if match is None:
+        return None
+    year, first, last = match.groups()
+    if first is None:
+        return int(year), 1, 12
+    return int(year), int(first), int(last or first)
+
+def drop_covered_files(file_names):
+    """
+    Drop the GRIB files whose months are all held by a larger chunk file of the same
+    year (e.g., monthly files left over from earlier runs next to 'ERA5_2020.grib'),
+    so that no period is extracted twice.
+    """
+    periods_by_year = {}
+    for name in file_names:
+        period = grib_file_months(name)
+        if period is not None:
+            periods_by_year.setdefault(period[0], []).append(period[1:])
+    kept = []
+    for name in file_names:
+        period = grib_file_months(name)
+        if period is not None:
+            year, first, last = period
+            if any(other_first <= first and last <= other_last and (other_first, other_last) != (first, last)
+                   for other_first, other_last in periods_by_year[year]):
+                logger.info(f"Skipping {name}: its months are covered by a larger GRIB file.")
+                continue
+        kept.append(name)
+    return kept
+
+def existing_chunk_files(year, month_start, month_end, data_dir, available=None):
+    """
+    Return the GRIB files already covering months month_start..month_end of a year:
+    either the chunk file itself or a complete set of monthly files (as written with
+    one-month chunks). Returns None if the period is not fully available.
+    If given, available is the set of file names in data_dir (saves a stat per file).
+    """
+    if available is None:
+        exists = os.path.exists
+    else:
+        exists = lambda path: os.path.basename(path) in available
+    chunk_path = os.path.join(data_dir, grib_file_name(year, month_start, month_end))
+    if exists(chunk_path):
+        return [chunk_path]
+    monthly_paths = [os.path.join(data_dir, grib_file_name(year, month, month))
+                     for month in range(month_start, month_end + 1)]
+    if all(exists(path) for path in monthly_paths):
+        return monthly_paths
+    return None
+
 def warn_missing_files(years, data_dir):
     """
-    Check for missing monthly GRIB files in the specified years range and warn the user.
+    Check for missing GRIB files in the specified years range and warn the user.
     """
+    # One directory listing instead of an os.path.exists call per expected file.
+    available = set(os.listdir(data_dir)) if os.path.isdir(data_dir) else set()
     missing = []
     for year in years:
-        for month in range(1, 13):
-            file_name = f"ERA5_{year}_{month:02d}.grib"
-            file_path = os.path.join(data_dir, file_name)
-            if not os.path.exists(file_path):
-                missing.append(file_name)
+        for month_start, month_end in month_chunks(CHUNK_MONTHS):
+            if existing_chunk_files(year, month_start, month_end, data_dir, available) is None:
+                missing.append(grib_file_name(year, month_start, month_end))
     if missing:
-        warning_msg = "Warning: The following monthly GRIB files are missing:\n" + "\n".join(missing)
+        warning_msg = "Warning: The following GRIB files are missing:\n" + "\n".join(missing)
         print(warning_msg)
-        logging.warning(warning_msg)
+        logger.warning(warning_msg)
     else:
-        info_msg = "All monthly GRIB files in the specified years range exist."
+        info_msg = "All GRIB files in the specified years range exist."
         print(info_msg)
-        logging.info(info_msg)
+        logger.info(info_msg)
+
+def create_cds_client():
+    """
+    Create a CDS API client; raises if cdsapi is missing or not configured. cdsapi is
+    imported here rather than at module level, so Option 2 and the spawned GRIB workers
+    do not pay for it.
+    """
+    import cdsapi
+    return cdsapi.Client()
 
 def initialize_cds_client():
     """
-    Initialize and return the CDS API client.
+    Initialize and return the CDS API client, exiting if it cannot be created.
+    Called from the main thread, so that a missing cdsapi or a bad ~/.cdsapirc stops
+    the run before any work is done.
     """
     try:
-        client = cdsapi.Client()
-        logging.info("CDS API client initialized successfully.")
+        client = create_cds_client()
+        logger.info("CDS API client initialized successfully.")
         return client
     except Exception as e:
-        logging.error(f"Failed to initialize CDS API client. Error: {e}")
+        logger.error(f"Failed to initialize CDS API client. Error: {e}")
         sys.exit(1)
 
-def download_monthly_data(client, year, month, area, grid, output_dir):
+def retry_delay(attempt, error):
     """
-    Download ERA5 monthly data for a given year and month using param IDs.
+    Return the number of seconds to wait before retrying a failed CDS request.
+    Honors the Retry-After header of HTTP errors (e.g., 429 Too Many Requests) when present;
+    otherwise uses a jittered exponential backoff so concurrent downloads do not retry in lockstep.
     """
-    file_name = f"ERA5_{year}_{month:02d}.grib"
-    file_path = os.path.join(output_dir, file_name)
-    
-    if os.path.exists(file_path):
-        logging.info(f"Data for {year}-{month:02d} exists. Skipping download.")
-        return file_path, False
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form: fall back to the backoff below.
+    return min(MAX_RETRY_DELAY, RETRY_BASE_DELAY * 2 ** attempt * random.uniform(0.5, 1.5))
 
-    days_in_month = calendar.monthrange(year, month)[1]
+def is_fatal_error(error):
+    """
+    Return True if a failed CDS request must not be retried (see FATAL_HTTP_STATUSES).
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status in FATAL_HTTP_STATUSES
+
+# A cdsapi.Client instance must not be shared by concurrent retrieve() calls,
+# so each download thread lazily creates its own.
+_thread_local = threading.local()
+
+def get_thread_cds_client():
+    """
+    Return the CDS API client owned by the calling thread, creating it on first use.
+    Failures raise (instead of exiting) and are reported for the download that hit them.
+    """
+    client = getattr(_thread_local, 'client', None)
+    if client is None:
+        client = create_cds_client()
+        _thread_local.client = client
+    return client
+
+def download_chunk_data(year, month_start, month_end, area, grid, output_dir):
+    """
+    Download ERA5 data for months month_start..month_end of a given year using param IDs,
+    in a single CDS request. Returns the list of GRIB files covering the period (empty
+    on failure) and whether a download took place.
+    Safe to call concurrently from several threads (one CDS client per thread).
+    """
+    period = f"{year}-{month_start:02d}" if month_start == month_end else f"{year}-{month_start:02d}..{month_end:02d}"
+    existing = existing_chunk_files(year, month_start, month_end, output_dir)
+    if existing:
+        logger.info(f"Data for {period} exists. Skipping download.")
+        return existing, False
+
+    file_path = os.path.join(output_dir, grib_file_name(year, month_start, month_end))
+    months = range(month_start, month_end + 1)
+    # Days that do not exist in a given month (e.g., 30 February) are dropped by MARS.
+    days_in_month = max(calendar.monthrange(year, month)[1] for month in months)
     days = [f"{d:02d}" for d in range(1, days_in_month + 1)]
     
     request_dict = {
@@ -169,100 +390,382 @@ def download_monthly_data(client, year, month, area, grid, output_dir):
         'format': 'grib',
         'param': PARAM_IDS,
         'year': [str(year)],
-        'month': [f"{month:02d}"],
+        'month': [f"{month:02d}" for month in months],
         'day': days,
         'time': [f"{h:02d}:00" for h in range(24)],
         'area': area,  # Format: [North, West, South, East]
         'grid': grid,
     }
 
+    client = get_thread_cds_client()
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            logging.info(f"Attempt {attempt}: Downloading data for {year}-{month:02d}...")
+            logger.info(f"Attempt {attempt}: Downloading data for {period}...")
             client.retrieve('reanalysis-era5-single-levels', request_dict, file_path)
-            logging.info(f"Successfully downloaded data for {year}-{month:02d}.")
-            return file_path, True
+            logger.info(f"Successfully downloaded data for {period}.")
+            return [file_path], True
         except Exception as e:
-            logging.warning(f"Attempt {attempt}: Failed for {year}-{month:02d}. Error: {e}")
+            logger.warning(f"Attempt {attempt}: Failed for {period}. Error: {e}")
+            if is_fatal_error(e):
+                logger.error(f"Not retrying {period}: check the CDS API key and dataset licence.")
+                return [], False
             if attempt < MAX_RETRIES:
-                wait_time = REQUEST_DELAY * attempt
-                logging.info(f"Retrying after {wait_time} seconds...")
+                wait_time = retry_delay(attempt, e)
+                logger.info(f"Retrying {period} after {wait_time:.0f} seconds...")
                 time.sleep(wait_time)
             else:
-                logging.error(f"All {MAX_RETRIES} attempts failed for {year}-{month:02d}.")
-                return None, False
+                logger.error(f"All {MAX_RETRIES} attempts failed for {period}.")
+                return [], False
 
-def process_grib_file_df(file_path):
+def extraction_cache_path(file_path):
     """
-    Process a GRIB file to extract selected data and return a pandas DataFrame.
+    Path of the Parquet sidecar caching the data extracted from a GRIB file
+    (e.g., 'grib/ERA5_2020_01-02.parquet' for 'grib/ERA5_2020_01-02.grib').
+    """
+    return os.path.splitext(file_path)[0] + '.parquet'
+
+def load_cached_extraction(file_path):
     """
+    Return the DataFrame cached for a GRIB file, or None if there is no cache, the GRIB
+    file is newer than the cache, the cache was written with other EXTRACTION_SETTINGS,
+    or it cannot be read.
+    """
+    cache_path = extraction_cache_path(file_path)
     try:
-        import pygrib  # Local import for each process
+        if os.path.getmtime(cache_path) < os.path.getmtime(file_path):
+            return None
+        import pyarrow.parquet as pq
+        table = pq.read_table(cache_path)
+    except (OSError, ImportError):
+        return None
     except Exception as e:
-        logging.error(f"Failed to import pygrib in process_grib_file_df: {e}")
+        logger.warning(f"Ignoring unreadable cache {cache_path}: {e}")
         return None
+    if (table.schema.metadata or {}).get(CACHE_SETTINGS_KEY) != EXTRACTION_SETTINGS.encode():
+        logger.info(f"Ignoring cache {cache_path}: written with other extraction settings.")
+        return None
+    return table.to_pandas()
 
+def save_cached_extraction(df, file_path):
+    """
+    Cache the DataFrame extracted from a GRIB file in its Parquet sidecar, tagged with
+    EXTRACTION_SETTINGS (requires pyarrow).
+    """
+    cache_path = extraction_cache_path(file_path)
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.debug(f"pyarrow is not installed; not caching {file_path}.")
+        return
     try:
-        grbs = pygrib.open(file_path)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), CACHE_SETTINGS_KEY: EXTRACTION_SETTINGS.encode()}
+        pq.write_table(table.replace_schema_metadata(metadata), cache_path, compression='zstd')
     except Exception as e:
-        logging.error(f"Failed to open {file_path}. Error: {e}")
+        logger.warning(f"Failed to write cache {cache_path}: {e}")
+
+def idw_weights(lats, lons):
+    """
+    Precompute the IDW interpolation of a grid at the target coordinate.
+    Returns (nearest_index, None) if a grid point coincides with the target, otherwise
+    (None, weights) with flattened float32 weights normalized to sum to 1, so that the
+    interpolated value of a flattened float32 field is simply weights @ values.
+    """
+    # Squared distances: 1 / dist**p is computed as 1 / dist2**(p / 2) without a square root.
+    dist2 = (lats - LATITUDE)**2 + (lons - LONGITUDE)**2
+    nearest_idx = int(dist2.argmin())
+    if dist2.flat[nearest_idx] < 1e-12:
+        return nearest_idx, None
+    weights = 1.0 / dist2 if IDW_POWER == 2 else 1.0 / dist2**(IDW_POWER / 2)
+    return None, (weights / np.sum(weights)).ravel().astype(np.float32)
+
+# IDW weights by grid geometry, kept for the lifetime of a worker process: all files of
+# a run normally share one grid, so the weights are only computed for the first file.
+_weights_cache = {}
+
+def grid_geometry(grb):
+    """
+    Return the grid geometry of a GRIB message (size and corner coordinates), or None
+    when it is not a regular lat/lon grid.
+    """
+    try:
+        return (grb.Ni, grb.Nj,
+                grb.latitudeOfFirstGridPointInDegrees, grb.longitudeOfFirstGridPointInDegrees,
+                grb.latitudeOfLastGridPointInDegrees, grb.longitudeOfLastGridPointInDegrees)
+    except Exception:
         return None
 
-    data_records = {}
-    
-    for grb in grbs:
-        try:
-            valid_time = grb.validDate.strftime('%Y-%m-%d %H:%M:%S')
-            var_key = None
-            # First, try to match using the GRIB message short name.
-            if grb.shortName in VARIABLES:
-                var_key = grb.shortName
-            else:
-                # Fallback: try matching using the dot-separated Parameter ID.
-                try:
-                    param_num = grb.parameterNumber  # typically an integer, e.g., 229
-                    table2 = getattr(grb, 'table2Version', None)  # e.g., 140
-                except Exception:
-                    param_num = None
-                    table2 = None
-                if param_num is not None and table2 is not None:
-                    grb_param_id = f"{param_num}.{table2}"
-                    for key, expected_id in VARIABLES.items():
-                        if grb_param_id == format_param_id(expected_id):
-                            var_key = key
-                            break
-            if var_key is None:
-                continue
+def grid_weights(grb):
+    """
+    Return idw_weights() for the grid of a GRIB message, cached by grid_geometry()
+    so that grb.latlons() is only built for new grids.
+    """
+    key = grid_geometry(grb)
+    if key is None:  # Not a regular lat/lon grid; do not cache.
+        return idw_weights(*grb.latlons())
+    if key not in _weights_cache:
+        _weights_cache[key] = idw_weights(*grb.latlons())
+    return _weights_cache[key]
+
+def match_param_id(grb):
+    """
+    Return the VARIABLES key whose Parameter ID (e.g., 140229) matches a GRIB message,
+    or None. Used when a message does not carry the expected short name.
+    """
+    try:
+        param_id = int(grb.paramId)
+    except Exception:
+        return None
+    return PARAM_ID_TO_KEY.get(param_id)
 
-            data_array, lats, lons = grb.data()
-            dist = np.sqrt((lats - LATITUDE)**2 + (lons - LONGITUDE)**2)
-            if np.any(dist < 1e-6):
-                value = data_array.flat[dist.argmin()]
-            else:
-                p = 2  # IDW power factor.
-                weights = 1.0 / (dist**p)
-                value = np.sum(weights * data_array) / np.sum(weights)
+def select_variable_messages(pygrib, file_path):
+    """
+    Yield (var_key, message) pairs for the messages of a GRIB file holding VARIABLES,
+    in a single pass over the file. Messages are matched by short name, or by
+    Parameter ID when they do not carry the expected short name.
+    """
+    grbs = pygrib.open(file_path)
+    try:
+        for grb in grbs:
+            key = grb.shortName
+            if key not in VARIABLES:
+                key = match_param_id(grb)
+                if key is None:
+                    continue
+            yield key, grb
+    finally:
+        grbs.close()
 
-            if valid_time not in data_records:
-                data_records[valid_time] = {}
-            data_records[valid_time][var_key] = value
+def process_grib_file_df(file_path):
+    """
+    Process a GRIB file to extract selected data and return a pandas DataFrame.
+    The result is cached in a Parquet sidecar, so unchanged files are only decoded once.
+    """
+    cached = load_cached_extraction(file_path)
+    if cached is not None:
+        return cached
+
+    pygrib = _pygrib
+    if pygrib is None:
+        try:
+            import pygrib  # Not imported by _init_worker (e.g., called outside the pool).
         except Exception as e:
-            logging.warning(f"Error processing a GRIB message in {file_path}: {e}")
-            continue
+            logger.error(f"Failed to import pygrib in process_grib_file_df: {e}")
+            return None
+
+    # Fields are collected per variable and grid, with the grid's IDW weights looked up
+    # once per group, and interpolated together afterwards: stacking the T messages of a
+    # variable into V[T, grid points] turns the IDW into a single matrix-vector product
+    # instead of one small sum per message.
+    fields = {}
+    try:
+        for var_key, grb in select_variable_messages(pygrib, file_path):
+            try:
+                valid_date = grb.validDate
+                data_array = grb.values
+                group = (var_key, grid_geometry(grb) or data_array.shape)
+                if group not in fields:
+                    fields[group] = ([], [], grid_weights(grb))
+                dates, stack, _ = fields[group]
+                # Masked (e.g., land) points become NaN and are left out of the sums below.
+                stack.append(np.ma.filled(data_array.astype(np.float32), np.nan).ravel())
+                dates.append(valid_date)
+            except Exception as e:
+                logger.warning(f"Error processing a GRIB message in {file_path}: {e}")
+                continue
+    except Exception as e:
+        logger.error(f"Failed to read {file_path}. Error: {e}")
+        return None
 
-    grbs.close()
-    if not data_records:
-        logging.warning(f"No data extracted from {file_path}.")
+    if not fields:
+        logger.warning(f"No data extracted from {file_path}.")
         return None
 
-    records = []
-    for dt, vars_data in data_records.items():
-        row = {'datetime': dt}
-        for key in VARIABLES.keys():
-            row[key] = vars_data.get(key, None)
-        records.append(row)
+    columns = {}
+    for (var_key, _), (dates, stack, (nearest_idx, w)) in fields.items():
+        V = np.asarray(stack)
+        if nearest_idx is not None:
+            interpolated = V[:, nearest_idx]
+        else:
+            missing = np.isnan(V)
+            interpolated = np.where(missing, 0, V) @ w
+            interpolated[missing.all(axis=1)] = np.nan
+        columns.setdefault(var_key, []).append((np.array(dates, dtype='datetime64[s]'), interpolated))
+
+    # One row per valid time (sorted), one float32 column per variable.
+    times = np.unique(np.concatenate([d for parts in columns.values() for d, _ in parts]))
+    values = np.full((len(times), len(VARIABLES)), np.nan, dtype=np.float32)
+    for col, key in enumerate(VARIABLES):
+        for dates, interpolated in columns.get(key, []):
+            values[np.searchsorted(times, dates), col] = interpolated
+
+    df = pd.DataFrame(values, columns=list(VARIABLES.keys()))
+    df.insert(0, 'datetime', times)
+    save_cached_extraction(df, file_path)
+    return df
+
+def write_parquet(df, output_path):
+    """
+    Write the extracted time series to a Parquet file (zstd-compressed, float32 variables).
+    Parquet output is skipped with a warning if pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.warning("pyarrow is not installed; skipping Parquet output.")
+        return
+
+    schema = pa.schema([('datetime', pa.timestamp('ns'))] + [(key, pa.float32()) for key in VARIABLES])
+    df = df.astype({key: 'float32' for key in VARIABLES})
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    with pq.ParquetWriter(output_path, schema, compression='zstd') as writer:
+        writer.write_table(table)
+    logger.info(f"Parquet file written to {output_path}.")
+
+def write_csv(df, output_path):
+    """
+    Write the extracted time series to a CSV file, using pyarrow's multithreaded CSV
+    writer when it is installed and pandas otherwise (see CSV_FLOAT_FORMAT).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df.to_csv(output_path, index=False, float_format=CSV_FLOAT_FORMAT)
+        return
+
+    schema = pa.schema([('datetime', pa.timestamp('s'))] + [(key, pa.float32()) for key in VARIABLES])
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    with open(output_path, 'wb') as f:
+        # Header written by hand: pyarrow would quote the column names.
+        f.write((','.join(table.column_names) + '\n').encode())
+        pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+
+def write_results(df, output_paths):
+    """
+    Write the sorted time series to each requested output format ({format: path}).
+    """
+    if 'csv' in output_paths:
+        write_csv(df, output_paths['csv'])
+        logger.info(f"CSV file written to {output_paths['csv']}.")
+    if 'parquet' in output_paths:
+        write_parquet(df, output_paths['parquet'])
+
+def downloaded_grib_files(jobs):
+    """
+    Download the (year, first_month, last_month) jobs concurrently and yield the GRIB
+    file paths as each download completes. Downloads run in threads, since the work is
+    bound by the CDS queue.
+    """
+    downloader = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    try:
+        downloads = {
+            downloader.submit(download_chunk_data, year, month_start, month_end, AREA, GRID, DATA_DIR): grib_file_name(year, month_start, month_end)
+            for year, month_start, month_end in jobs
+        }
+        for future in tqdm(as_completed(downloads), total=len(downloads), desc="Downloading ERA5 data"):
+            try:
+                file_paths, _ = future.result()
+            except Exception as exc:
+                logger.error(f"Exception while downloading {downloads[future]}: {exc}")
+                continue
+            yield from file_paths
+    finally:
+        # On an error, Ctrl-C or an abandoned generator, drop the queued CDS requests
+        # instead of running them all (requests already in flight still complete).
+        downloader.shutdown(wait=False, cancel_futures=True)
+
+def prefetch_file(file_path):
+    """
+    Ask the OS to start reading a file into the page cache in the background, so that
+    a worker opening it later does not wait on the disk. No-op where posix_fadvise is
+    not available (e.g., Windows).
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
 
-    return pd.DataFrame(records)
+def extract_grib_files(grib_files):
+    """
+    Extract data from GRIB files in the process pool and return the non-empty DataFrames
+    in file-name (i.e., chronological) order. Files are submitted as grib_files yields
+    them, so with downloaded_grib_files() the extraction overlaps with the remaining downloads.
+    Files with an up-to-date extraction cache are read here directly; worker processes
+    are only started if some file actually needs decoding.
+    """
+    results = {}
+    # Workers take files in submission order; the next prefetch_window files are read
+    # ahead into the page cache while the current ones are being decoded.
+    prefetch_window = 2 * PROCESS_WORKERS
+    submitted = []
+    executor = process_pool()
+    try:
+        futures = {}
+        for file in grib_files:
+            cached = load_cached_extraction(file)
+            if cached is not None and not cached.empty:
+                results[file] = cached
+                logger.info(f"Loaded cached data for {file}.")
+            else:
+                futures[executor.submit(process_grib_file_df, file)] = file
+                if len(submitted) < prefetch_window:
+                    prefetch_file(file)
+                submitted.append(file)
+        for done, future in enumerate(tqdm(as_completed(futures), total=len(futures), desc="Processing GRIB files")):
+            if done + prefetch_window < len(submitted):
+                prefetch_file(submitted[done + prefetch_window])
+            file = futures[future]
+            try:
+                df = future.result()
+                if df is not None and not df.empty:
+                    results[file] = df
+                    logger.info(f"Processed data from {file}.")
+                else:
+                    logger.error(f"No data extracted from {file}.")
+            except Exception as exc:
+                logger.error(f"Exception while processing {file}: {exc}")
+    except BaseException:
+        # On an error or Ctrl-C, drop the files still queued instead of decoding them all.
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        if hasattr(grib_files, 'close'):
+            grib_files.close()  # Stops downloaded_grib_files() and its queued downloads.
+        executor.shutdown()
+    return [results[file] for file in sorted(results)]
+
+def save_results(dataframes, output_paths):
+    """
+    Replace the output files with the combined data, sorted by datetime.
+    Returns False if there is no data to write.
+    """
+    for output_path in output_paths.values():
+        if os.path.exists(output_path):
+            os.remove(output_path)
+            logger.info(f"Deleted existing output file at {output_path}.")
+    if not dataframes:
+        return False
+    final_df = pd.concat(dataframes, ignore_index=True)
+    # Each file's rows are sorted by time and the files come in chronological order, so
+    # the combined series is normally sorted already; sort only if it is not (e.g.,
+    # overlapping files or caches written by older versions).
+    if not final_df["datetime"].is_monotonic_increasing:
+        final_df.sort_values(by="datetime", inplace=True, kind="stable")
+    # Partially overlapping chunk files (not removed by drop_covered_files) would repeat
+    # time steps; keep the first occurrence of each.
+    if not final_df["datetime"].is_unique:
+        final_df.drop_duplicates(subset="datetime", keep="first", inplace=True)
+    write_results(final_df, output_paths)
+    return True
 
 # ----------------------------- Main Execution -----------------------------
 def main():
@@ -279,89 +782,34 @@ def main():
         print("Invalid option selected. Exiting.")
         return
 
+    _ensure_env()
     overall_start_time = time.time()
-    OUTPUT_CSV = os.path.join(RESULTS_DIR, 'download_era5_data.csv')
+    output_paths = {fmt: os.path.join(RESULTS_DIR, f'download_era5_data.{fmt}') for fmt in OUTPUT_FORMATS}
 
     if user_option == '2':
-        if os.path.exists(OUTPUT_CSV):
-            os.remove(OUTPUT_CSV)
-            logging.info(f"Deleted existing CSV file at {OUTPUT_CSV}.")
-        grib_files = sorted([os.path.join(DATA_DIR, f) for f in os.listdir(DATA_DIR) if f.endswith('.grib')])
-        dataframes = []
-        timeout_per_file = 120  # seconds per file processing timeout.
-        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
-            futures = {executor.submit(process_grib_file_df, file): file for file in grib_files}
-            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing GRIB files"):
-                file = futures[future]
-                try:
-                    df = future.result(timeout=timeout_per_file)
-                    if df is not None and not df.empty:
-                        dataframes.append(df)
-                        logging.info(f"Processed data from {file}.")
-                    else:
-                        logging.error(f"No data extracted from {file}.")
-                except TimeoutError:
-                    logging.error(f"Processing {file} timed out.")
-                    future.cancel()
-                except Exception as exc:
-                    logging.error(f"Exception while processing {file}: {exc}")
-        if dataframes:
-            final_df = pd.concat(dataframes, ignore_index=True)
-            final_df["datetime"] = pd.to_datetime(final_df["datetime"])
-            final_df.sort_values(by="datetime", inplace=True)
-            final_df.to_csv(OUTPUT_CSV, index=False)
-            print("Data processing completed (Option 2).")
-        else:
-            print("No data was extracted from any GRIB file.")
+        # Largest files first, so that no big file is left running alone at the end.
+        grib_names = drop_covered_files([f for f in os.listdir(DATA_DIR) if f.endswith('.grib')])
+        grib_files = sorted([os.path.join(DATA_DIR, f) for f in grib_names], key=os.path.getsize, reverse=True)
     else:
-        client = initialize_cds_client()
-        total_requests = len(YEARS) * 12
-        pbar = tqdm(total=total_requests, desc="Downloading and Processing ERA5 Data")
-        dataframes = []
-        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
-            futures = []
-            for year in YEARS:
-                for month in range(1, 13):
-                    file_path, downloaded = download_monthly_data(client, year, month, AREA, GRID, DATA_DIR)
-                    if file_path:
-                        future = executor.submit(process_grib_file_df, file_path)
-                        futures.append((future, file_path))
-                    pbar.update(1)
-                    if downloaded:
-                        time.sleep(REQUEST_DELAY)
-            pbar.close()
-            for future, file in tqdm(futures, desc="Processing GRIB files"):
-                try:
-                    df = future.result(timeout=120)
-                    if df is not None and not df.empty:
-                        dataframes.append(df)
-                        logging.info(f"Processed data from {file}.")
-                    else:
-                        logging.error(f"No data extracted from {file}.")
-                except TimeoutError:
-                    logging.error(f"Processing {file} timed out.")
-                except Exception as exc:
-                    logging.error(f"Exception while processing {file}: {exc}")
-
-        if os.path.exists(OUTPUT_CSV):
-            os.remove(OUTPUT_CSV)
-            logging.info(f"Deleted existing CSV file at {OUTPUT_CSV}.")
-        if dataframes:
-            final_df = pd.concat(dataframes, ignore_index=True)
-            final_df["datetime"] = pd.to_datetime(final_df["datetime"])
-            final_df.sort_values(by="datetime", inplace=True)
-            final_df.to_csv(OUTPUT_CSV, index=False)
-            logging.info("CSV file sorted by datetime column.")
-        else:
-            logging.error("No data was extracted in Option 1.")
-            print("No data was extracted in Option 1.")
+        # Fail fast on a missing or misconfigured cdsapi; download threads create their own clients.
+        initialize_cds_client()
+        jobs = [(year, month_start, month_end)
+                for year, (month_start, month_end) in itertools.product(YEARS, month_chunks(CHUNK_MONTHS))]
+        grib_files = downloaded_grib_files(jobs)
+
+    dataframes = extract_grib_files(grib_files)
+    if save_results(dataframes, output_paths):
+        print(f"Data processing completed (Option {user_option}).")
+    else:
+        logger.error("No data was extracted from any GRIB file.")
+        print("No data was extracted from any GRIB file.")
 
     warn_missing_files(YEARS, DATA_DIR)
     
     overall_end_time = time.time()
     total_time = overall_end_time - overall_start_time
-    logging.info("Data processing completed.")
-    logging.info(f"Total time: {total_time:.2f} seconds")
+    logger.info("Data processing completed.")
+    logger.info(f"Total time: {total_time:.2f} seconds")
     print("Data processing completed.")
     print(f"Total time: {total_time:.2f} seconds")
 